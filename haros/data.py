@@ -26,11 +26,17 @@
 from collections import Counter
 import cPickle
 import datetime
+import json
 import logging
 import os
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 from .metamodel import Location, Resource
+from .util import atomic_open
 
 
 ###############################################################################
@@ -481,7 +487,7 @@ class HarosSettings(object):
     @classmethod
     def parse_from(cls, path):
         with open(path, "r") as handle:
-            data = yaml.safe_load(handle) or {}
+            data = yaml.load(handle, Loader=SafeLoader) or {}
         env = data.get("environment")
         if env == "copy" or env == "all" or env is True:
             env = dict(os.environ)
@@ -566,10 +572,27 @@ class HarosDatabase(LoggingObject):
 
     # Used at startup to load the common rules and metrics
     def load_definitions(self, data_file, prefix="", ignored_tags=None,
-                         ignored_rules=None, ignored_metrics=None):
+                         ignored_rules=None, ignored_metrics=None,
+                         cache_file=None):
         self.log.debug("HarosDatabase.load_definitions(%s)", data_file)
-        with open(data_file, "r") as handle:
-            data = yaml.safe_load(handle)
+        data = None
+        stamp = None
+        if cache_file:
+            # taken before parsing, so a concurrent edit invalidates the cache
+            try:
+                st = os.stat(data_file)
+                stamp = [st.st_mtime, st.st_size]
+            except OSError:
+                pass # reported when opening the file below
+            else:
+                data = self._read_definitions_cache(data_file, stamp,
+                                                    cache_file)
+        if data is None:
+            with open(data_file, "r") as handle:
+                data = yaml.load(handle, Loader=SafeLoader)
+            if stamp is not None:
+                self._write_definitions_cache(data_file, stamp, cache_file,
+                                              data)
         rules = self.register_rules(data.get("rules", {}), prefix=prefix,
                                     ignored_rules=ignored_rules,
                                     ignored_tags=ignored_tags)
@@ -577,6 +600,27 @@ class HarosDatabase(LoggingObject):
                                         ignored_metrics=ignored_metrics)
         return (rules, metrics)
 
+    def _read_definitions_cache(self, data_file, stamp, cache_file):
+        # the cache is only valid for the exact version of the YAML source
+        try:
+            with open(cache_file, "r") as handle:
+                cache = json.load(handle)
+        except (IOError, OSError, ValueError) as e:
+            self.log.debug("No usable definitions cache: %s", e)
+            return None
+        if cache.get("source") != data_file or cache.get("stamp") != stamp:
+            return None
+        self.log.debug("Using definitions cache %s", cache_file)
+        return cache.get("definitions")
+
+    def _write_definitions_cache(self, data_file, stamp, cache_file, data):
+        try:
+            with atomic_open(cache_file, "w") as handle:
+                handle.write(json.dumps({"source": data_file, "stamp": stamp,
+                                         "definitions": data}))
+        except (IOError, OSError) as e:
+            self.log.warning("Could not save definitions cache: %s", e)
+
     def register_rules(self, rules, prefix="", ignored_rules=None,
                        ignored_tags=None):
         allowed = []
@@ -619,7 +663,7 @@ class HarosDatabase(LoggingObject):
     def save_state(self, file_path):
         self.log.debug("HarosDatabase.save_state(%s)", file_path)
         self._compact()
-        with open(file_path, "wb") as handle:
+        with atomic_open(file_path, "wb") as handle:
             cPickle.dump(self, handle, cPickle.HIGHEST_PROTOCOL)
 
     @staticmethod
@@ -629,9 +673,13 @@ class HarosDatabase(LoggingObject):
             return cPickle.load(handle)
 
     def _compact(self):
+        # past reports are only used for their timestamp and statistics;
+        # dropping the rest stops them from retaining old metamodel objects
         for report in self.history:
             report.project = None
             report.by_package = {}
+            report.by_config = {}
+            report.violations = []
         # NOTE IMPORTANT!
         # storing bonsai source trees can sometimes hit the recursion limit
         for node in self.nodes.itervalues():
@@ -52,29 +52,27 @@ class JsonExporter(LoggingObject):
         if not overwrite and os.path.isfile(out):
             with open(out, "r") as f:
                 data = json.load(f)
+            index = {}
+            for i in xrange(len(data)):
+                index.setdefault(data[i]["id"], i)
             for p in projects:
-                is_new = True
-                for i in xrange(len(data)):
-                    if data[i]["id"] == p.name:
-                        is_new = False
-                        data[i] = p.to_JSON_object()
-                        break
-                if is_new:
+                i = index.get(p.name)
+                if i is None:
+                    index[p.name] = len(data)
                     data.append(p.to_JSON_object())
+                else:
+                    data[i] = p.to_JSON_object()
         else:
             data = [p.to_JSON_object() for p in projects]
-        with open(out, "w") as f:
-            self.log.debug("Writing to %s", out)
-            json.dump(data, f)
+        self._write_json(out, data)
 
     def export_packages(self, datadir, packages):
         self.log.info("Exporting package data.")
         out = os.path.join(datadir, "packages.json")
         if isinstance(packages, dict):
             packages = packages.viewvalues()
-        with open(out, "w") as f:
-            self.log.debug("Writing to %s", out)
-            json.dump([self._pkg_analysis_JSON(pkg) for pkg in packages], f)
+        self._write_json(out,
+                         [self._pkg_analysis_JSON(pkg) for pkg in packages])
 
     def export_rules(self, datadir, rules):
         self.log.info("Exporting analysis rules.")
@@ -93,9 +91,7 @@ class JsonExporter(LoggingObject):
             data = [v.to_JSON_object() for v in report.violations]
             for fa in report.file_analysis:
                 data.extend(v.to_JSON_object() for v in fa.violations)
-            with open(out, "w") as f:
-                self.log.debug("Writing to %s", out)
-                json.dump(data, f)
+            self._write_json(out, data)
 
     def export_runtime_violations(self, datadir, config_reports):
         self.log.info("Exporting reported runtime rule violations.")
@@ -118,9 +114,7 @@ class JsonExporter(LoggingObject):
             data = [m.to_JSON_object() for m in report.metrics]
             for fa in report.file_analysis:
                 data.extend(m.to_JSON_object() for m in fa.metrics)
-            with open(out, "w") as f:
-                self.log.debug("Writing to %s", out)
-                json.dump(data, f)
+            self._write_json(out, data)
 
     def export_configurations(self, datadir, config_reports):
         self.log.info("Exporting launch configurations.")
@@ -151,9 +145,7 @@ class JsonExporter(LoggingObject):
             data["queries"] = list(queries.itervalues())
             configs.append(data)
         out = os.path.join(datadir, "configurations.json")
-        with open(out, "w") as f:
-            self.log.debug("Writing to %s", out)
-            json.dump([config for config in configs], f)
+        self._write_json(out, configs)
 
     def export_summary(self, datadir, report, past):
         self.log.info("Exporting analysis summary.")
@@ -178,17 +170,20 @@ class JsonExporter(LoggingObject):
         data["history"]["metrics"].append(stats.metrics_issue_count)
         data["history"]["complexity"].append(stats.avg_complexity)
         data["history"]["function_length"].append(stats.avg_function_length)
-        with open(out, "w") as f:
-            self.log.debug("Writing to %s", out)
-            json.dump(data, f)
+        self._write_json(out, data)
 
     def _export_collection(self, datadir, items, filename):
         out = os.path.join(datadir, filename)
         if isinstance(items, dict):
             items = items.viewvalues()
+        self._write_json(out, [item.to_JSON_object() for item in items])
+
+    def _write_json(self, out, data):
+        # json.dumps encodes in one shot with the C encoder, whereas
+        # json.dump falls back to the pure Python chunked encoder
+        self.log.debug("Writing to %s", out)
         with open(out, "w") as f:
-            self.log.debug("Writing to %s", out)
-            json.dump([item.to_JSON_object() for item in items], f)
+            f.write(json.dumps(data))
 
     def _query_object_JSON(self, obj, config):
         if isinstance(obj, Resource) and obj.configuration == config:
@@ -23,6 +23,8 @@
 # Imports
 ###############################################################################
 
+import cPickle
+import hashlib
 import logging
 from operator import attrgetter
 import os
@@ -31,6 +33,10 @@ import subprocess
 from urllib2 import urlopen, URLError
 import xml.etree.ElementTree as ET
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 from bonsai.model import CodeGlobalScope, pretty_str
 from bonsai.cpp.model import CppFunctionCall, CppDefaultArgument, CppOperator
@@ -51,7 +57,7 @@ from .metamodel import (
     Publication, Subscription, ServiceServerCall, ServiceClientCall, Location,
     ReadParameterCall, WriteParameterCall
 )
-from .util import cwd
+from .util import atomic_open, cwd
 
 
 ###############################################################################
@@ -89,9 +95,15 @@ class ProjectExtractor(LoggingObject):
         self.node_specs = None
         self.rules = None
 
-    def index_source(self, settings=None):
+    def index_source(self, settings=None, cache_file=None):
         self.log.debug("ProjectExtractor.index_source()")
         self._setup()
+        # repositories may change remotely and parsed nodes carry source
+        # trees, so the index cache only covers local, unparsed projects
+        if self.repositories or self.distribution or self.parse_nodes:
+            cache_file = None
+        if cache_file and self._load_index_cache(cache_file, settings):
+            return
         self._load_user_repositories()
         self._find_local_packages()
         if self.missing and self.distribution:
@@ -103,11 +115,13 @@ class ProjectExtractor(LoggingObject):
         self._populate_packages(settings=settings)
         self._update_node_cache()
         self._find_nodes(settings)
+        if cache_file:
+            self._save_index_cache(cache_file, settings)
 
     def _setup(self):
         try:
             with open(self.index_file, "r") as handle:
-                data = yaml.safe_load(handle)
+                data = yaml.load(handle, Loader=SafeLoader)
         except IOError as e:
             data = {}
         self.project = Project(data.get("project", "default"))
@@ -119,6 +133,72 @@ class ProjectExtractor(LoggingObject):
         self.node_specs = data.get("nodes", {})
         self.rules = data.get("rules", {})
 
+    def _index_cache_key(self, settings):
+        with open(self.index_file, "rb") as handle:
+            index_hash = hashlib.sha1(handle.read()).hexdigest()
+        return (os.path.abspath(self.index_file), index_hash,
+                os.path.abspath("."), sorted(self.packages),
+                settings.workspace if settings else None,
+                self.environment.get("ROS_PACKAGE_PATH"),
+                self.environment.get("CMAKE_PREFIX_PATH"))
+
+    def _source_fingerprint(self, packages):
+        digest = hashlib.sha1()
+        for pkg in packages:
+            if not pkg.path:
+                continue
+            for root, subdirs, files in os.walk(pkg.path, topdown = True):
+                subdirs[:] = [d for d in subdirs
+                              if d not in PackageExtractor.EXCLUDED]
+                subdirs.sort()
+                for filename in sorted(files):
+                    path = os.path.join(root, filename)
+                    digest.update(path)
+                    digest.update(repr(os.path.getmtime(path)))
+        return digest.hexdigest()
+
+    def _load_index_cache(self, cache_file, settings):
+        try:
+            with open(cache_file, "rb") as handle:
+                cache = cPickle.load(handle)
+            if cache["key"] != self._index_cache_key(settings):
+                return False
+            project = cache["project"]
+            if cache["fingerprint"] != self._source_fingerprint(
+                    project.packages):
+                return False
+        except Exception as e:
+            # any stale, corrupt or foreign cache just forces a rebuild
+            self.log.debug("No usable index cache: %s", e)
+            return False
+        missing = set(self.packages)
+        missing.difference_update(pkg.name for pkg in project.packages)
+        if missing:
+            return False
+        self.log.info("Using cached project index %s", cache_file)
+        self.project = project
+        self.missing = missing
+        if not settings is None:
+            settings.ignored_lines.update(cache["ignored_lines"])
+        return True
+
+    def _save_index_cache(self, cache_file, settings):
+        # packages that are missing now may show up in the next run
+        if self.missing:
+            return
+        try:
+            cache = {
+                "key": self._index_cache_key(settings),
+                "fingerprint": self._source_fingerprint(self.project.packages),
+                "project": self.project,
+                "ignored_lines": settings.ignored_lines if settings else {}
+            }
+            with atomic_open(cache_file, "wb") as handle:
+                cPickle.dump(cache, handle, cPickle.HIGHEST_PROTOCOL)
+        except (IOError, OSError, RuntimeError,
+                cPickle.PicklingError) as e:
+            self.log.warning("Could not save index cache: %s", e)
+
     def _load_user_repositories(self):
         self.log.info("Looking up user provided repositories.")
         extractor = RepositoryExtractor()
@@ -156,7 +236,8 @@ class ProjectExtractor(LoggingObject):
     def _load_distro_repositories(self):
         self.log.info("Looking up repositories from official distribution.")
         try:
-            data = yaml.safe_load(urlopen(self.distribution).read())["repositories"]
+            data = yaml.load(urlopen(self.distribution).read(),
+                             Loader=SafeLoader)["repositories"]
         except URLError as e:
             self.log.warning("Could not download distribution data.")
             return
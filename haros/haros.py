@@ -26,6 +26,8 @@
 # |-- index.yaml
 # |-- configs.yaml
 # |-- parse_cache.json
+# |-- definitions_cache.json
+# |-- index_cache.db
 # |-- log.txt
 # |-+ repositories
 #   |-+ ...
@@ -93,21 +95,41 @@
 ###############################################################################
 
 from argparse import ArgumentParser
-import json
+from collections import namedtuple
+import errno
+try:
+    import ujson as json
+except ImportError:
+    import json
 import logging
+from logging.handlers import MemoryHandler
+from multiprocessing.pool import ThreadPool
 import os
+import stat
 import tempfile
 
-from shutil import copyfile, rmtree
+from shutil import Error as ShutilError, copyfileobj, rmtree
 from pkg_resources import Requirement, resource_filename
+try:
+    from os import sendfile
+except ImportError:
+    try:
+        from sendfile import sendfile # pysendfile, for Python 2
+    except ImportError:
+        sendfile = None
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir # backport, for Python 2
+    except ImportError:
+        scandir = None
 
 from .data import HarosDatabase, HarosSettings
-from .extractor import ProjectExtractor
-from .config_builder import ConfigurationBuilder
-from .plugin_manager import Plugin
-from .analysis_manager import AnalysisManager
-from .export_manager import JsonExporter
-from . import visualiser as viz
+from .util import atomic_open
+# NOTE: the analysis stack (extractor, config_builder, plugin_manager,
+# analysis_manager, export_manager, visualiser) is imported by the
+# methods that need it, so that `haros init` and `--help` stay fast.
 
 
 ###############################################################################
@@ -123,6 +145,7 @@ class HarosLauncher(object):
     HAROS_DIR = os.path.join(os.path.expanduser("~"), ".haros")
     DEFAULT_INDEX = os.path.join(HAROS_DIR, "index.yaml")
     LOG_PATH = os.path.join(HAROS_DIR, "log.txt")
+    LOG_BUFFER = 64     # debug log records written to file at once
     VIZ_DIR = os.path.join(HAROS_DIR, "viz")
 
     DIR_STRUCTURE = {
@@ -165,9 +188,11 @@ class HarosLauncher(object):
     def launch(self, argv=None):
         args = self.parse_arguments(argv)
         self._set_directories(args)
+        log_handler = None
         if args.debug:
-            logging.basicConfig(filename=self.log_path, filemode="w",
-                                level=logging.DEBUG)
+            log_handler = self._debug_log_handler()
+            self.log.addHandler(log_handler)
+            self.log.setLevel(logging.DEBUG)
         else:
             logging.basicConfig(level=logging.WARNING)
         self.log.debug("Running from home directory: %s", self.haros_dir)
@@ -188,6 +213,11 @@ class HarosLauncher(object):
             return False
         finally:
             os.chdir(original_path)
+            if log_handler:
+                self.log.removeHandler(log_handler)
+                log_handler.flush()
+                log_handler.target.close()
+                log_handler.close()
 
     def command_init(self, args):
         if not self.initialised:
@@ -329,6 +359,18 @@ class HarosLauncher(object):
                             help = "start server without web browser")
         parser.set_defaults(command = self.command_viz)
 
+    def _debug_log_handler(self):
+        """Buffer debug records in memory and write them to the log file
+            in small batches, instead of writing and flushing every record.
+            Warnings and errors are written out immediately.
+        """
+        # the file is opened on the first flush, after the cwd may change
+        file_handler = logging.FileHandler(os.path.abspath(self.log_path),
+                                           mode="w", delay=True)
+        file_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        return MemoryHandler(self.LOG_BUFFER, flushLevel=logging.WARNING,
+                             target=file_handler)
+
     def _set_directories(self, args):
         if args.home:
             self.haros_dir = args.home
@@ -352,46 +394,86 @@ class HarosLauncher(object):
         self._generate_dir(self.haros_dir, self.DIR_STRUCTURE,
                            overwrite=overwrite)
         if overwrite or not os.path.exists(self.viz_dir):
+            from . import visualiser as viz
             viz.install(self.viz_dir, self.run_from_source, force=True)
         return True
 
     def _generate_dir(self, path, dir_dict, overwrite=True):
-        """Recursively create a given directory structure."""
+        """Create a given directory structure.
+            Each directory is listed once to find which entries exist,
+            instead of probing every entry of the structure separately.
+        """
         self.log.debug("HarosRunner._generate_dir %s %s", path, str(dir_dict))
-        for name, contents in dir_dict.iteritems():
-            new_path = os.path.join(path, name)
-            exists = os.path.exists(new_path)
-            if isinstance(contents, basestring):
-                if exists and not os.path.isfile(new_path):
-                    raise RuntimeError("Could not create file: " + new_path)
-                if overwrite or not exists:
-                    self.log.info("Creating %s", new_path)
-                    with open(new_path, "w") as handle:
-                        handle.write(contents)
-            elif isinstance(contents, dict):
-                if exists and not os.path.isdir(new_path):
-                    raise RuntimeError("Could not create dir: " + new_path)
-                if not exists:
-                    self.log.info("Creating %s", new_path)
-                    os.mkdir(new_path)
-                self._generate_dir(new_path, contents, overwrite=overwrite)
+        pending = [(path, dir_dict, True)]
+        while pending:
+            path, dir_dict, path_exists = pending.pop()
+            existing = set(os.listdir(path)) if path_exists else ()
+            for name, contents in dir_dict.iteritems():
+                new_path = os.path.join(path, name)
+                exists = name in existing
+                if isinstance(contents, basestring):
+                    if exists and not os.path.isfile(new_path):
+                        raise RuntimeError("Could not create file: " + new_path)
+                    if overwrite or not exists:
+                        self.log.info("Creating %s", new_path)
+                        with open(new_path, "w") as handle:
+                            handle.write(contents)
+                elif isinstance(contents, dict):
+                    if exists and not os.path.isdir(new_path):
+                        raise RuntimeError("Could not create dir: " + new_path)
+                    if not exists:
+                        self.log.info("Creating %s", new_path)
+                        os.mkdir(new_path)
+                    pending.append((new_path, contents, exists))
 
 
 ###############################################################################
 #   Base Command Runner
 ###############################################################################
 
+# HAROS targets POSIX systems, where joining internally generated path
+# components does not need the checks done by os.path.join.
+if os.sep == "/":
+    def _join(*parts):
+        return "/".join(parts)
+else:
+    _join = os.path.join
+
+
+HarosPaths = namedtuple("HarosPaths",
+                        ("repo", "export", "project", "viz", "pyflwor"))
+
+_paths_cache = {}
+
+def _haros_paths(haros_dir):
+    """Computes the standard subdirectories of a HAROS directory once."""
+    paths = _paths_cache.get(haros_dir)
+    if paths is None:
+        paths = HarosPaths(os.path.join(haros_dir, "repositories"),
+                           os.path.join(haros_dir, "export"),
+                           os.path.join(haros_dir, "projects"),
+                           os.path.join(haros_dir, "viz"),
+                           os.path.join(haros_dir, "pyflwor"))
+        _paths_cache[haros_dir] = paths
+    return paths
+
+
 class HarosRunner(object):
     """This is a base class for the specific commands that HAROS provides."""
 
+    __slots__ = ("root", "config_path", "repo_dir", "export_dir",
+                 "project_dir", "viz_dir", "pyflwor_dir", "log",
+                 "run_from_source", "settings")
+
     def __init__(self, haros_dir, config_path, log, run_from_source):
+        paths = _haros_paths(haros_dir)
         self.root               = haros_dir
         self.config_path        = config_path
-        self.repo_dir           = os.path.join(haros_dir, "repositories")
-        self.export_dir         = os.path.join(haros_dir, "export")
-        self.project_dir        = os.path.join(haros_dir, "projects")
-        self.viz_dir            = os.path.join(haros_dir, "viz")
-        self.pyflwor_dir        = os.path.join(haros_dir, "pyflwor")
+        self.repo_dir           = paths.repo
+        self.export_dir         = paths.export
+        self.project_dir        = paths.project
+        self.viz_dir            = paths.viz
+        self.pyflwor_dir        = paths.pyflwor
         self.log                = log or logging.getLogger()
         self.run_from_source    = run_from_source
         self.settings           = None
@@ -403,20 +485,36 @@ class HarosRunner(object):
         """Deletes all files within a directory."""
         self.log.debug("HarosRunner._empty_dir %s", dir_path)
         for filename in os.listdir(dir_path):
-            path = os.path.join(dir_path, filename)
-            if os.path.isfile(path):
-                self.log.debug("Removing file %s", path)
+            path = _join(dir_path, filename)
+            # unlink directly instead of stat'ing first; directories fail
+            # with EISDIR (Linux) or EPERM (macOS) and are left alone
+            try:
                 os.unlink(path)
-
-    def _ensure_dir(self, dir_path, empty = False):
+                self.log.debug("Removed file %s", path)
+            except OSError as e:
+                if e.errno == errno.EISDIR:
+                    continue
+                if e.errno == errno.EPERM and os.path.isdir(path):
+                    continue
+                raise
+
+    def _ensure_dir(self, dir_path):
         """Create a directory if it does not exist."""
         self.log.debug("HarosRunner._ensure_dir %s", dir_path)
-        if not os.path.isdir(dir_path):
-            if os.path.isfile(dir_path):
-                raise RuntimeError("Could not create dir: " + dir_path)
+        try:
+            mode = os.stat(dir_path).st_mode
+        except OSError:
             os.makedirs(dir_path)
-        elif empty:
-            self._empty_dir(dir_path)
+        else:
+            if not stat.S_ISDIR(mode):
+                raise RuntimeError("Could not create dir: " + dir_path)
+
+    def _reset_dir(self, dir_path):
+        """Replace a directory (and all its contents) with an empty one."""
+        self.log.debug("HarosRunner._reset_dir %s", dir_path)
+        if os.path.isdir(dir_path):
+            rmtree(dir_path)
+        self._ensure_dir(dir_path)
 
     def _load_settings(self):
         try:
@@ -432,38 +530,66 @@ class HarosRunner(object):
 class HarosCommonExporter(HarosRunner):
     """This is just an interface with common methods."""
 
+    __slots__ = ("project", "database", "export_viz", "data_dir",
+                 "io_projects_dir", "current_dir", "json_dir")
+
+    EXPORT_THREADS = 4
+
     def _prepare_project(self):
-        self.current_dir = os.path.join(self.io_projects_dir, self.project)
+        self.current_dir = _join(self.io_projects_dir, self.project)
         self._ensure_dir(self.current_dir)
-        self.json_dir = os.path.join(self.data_dir, self.project)
+        self.json_dir = _join(self.data_dir, self.project)
         self._ensure_dir(self.json_dir)
 
     def _export_project_data(self, exporter):
         report = self.database.report
-    # ----- general data
-        exporter.export_packages(self.json_dir, report.by_package)
-        exporter.export_rules(self.json_dir, self.database.rules)
-        exporter.export_metrics(self.json_dir, self.database.metrics)
-        exporter.export_summary(self.json_dir, report, self.database.history)
-    # ----- extracted configurations
-        exporter.export_configurations(self.json_dir, report.by_config)
-    # ----- compliance reports
-        out_dir = os.path.join(self.json_dir, "compliance")
-        self._ensure_dir(out_dir, empty = True)
-        exporter.export_other_violations(out_dir, report.violations)
-        out_dir = os.path.join(self.json_dir, "compliance", "source")
-        self._ensure_dir(out_dir, empty = True)
-        exporter.export_source_violations(out_dir, report.by_package)
-        out_dir = os.path.join(self.json_dir, "compliance", "runtime")
-        self._ensure_dir(out_dir, empty = True)
-        exporter.export_runtime_violations(out_dir, report.by_config)
-    # ----- metrics reports
-        out_dir = os.path.join(self.json_dir, "metrics")
-        self._ensure_dir(out_dir, empty = True)
-        exporter.export_measurements(out_dir, report.by_package)
+        json_dir = self.json_dir
+    # ----- output directories (must be ready before any export starts)
+        compliance_dir = _join(json_dir, "compliance")
+        self._reset_dir(compliance_dir)
+        source_dir = _join(compliance_dir, "source")
+        self._ensure_dir(source_dir)
+        runtime_dir = _join(compliance_dir, "runtime")
+        self._ensure_dir(runtime_dir)
+        metrics_dir = _join(json_dir, "metrics")
+        self._reset_dir(metrics_dir)
+        tasks = (
+        # ----- general data
+            (exporter.export_packages, (json_dir, report.by_package)),
+            (exporter.export_rules, (json_dir, self.database.rules)),
+            (exporter.export_metrics, (json_dir, self.database.metrics)),
+            (exporter.export_summary,
+                (json_dir, report, self.database.history)),
+        # ----- extracted configurations
+            (exporter.export_configurations, (json_dir, report.by_config)),
+        # ----- compliance reports
+            (exporter.export_other_violations,
+                (compliance_dir, report.violations)),
+            (exporter.export_source_violations,
+                (source_dir, report.by_package)),
+            (exporter.export_runtime_violations,
+                (runtime_dir, report.by_config)),
+        # ----- metrics reports
+            (exporter.export_measurements, (metrics_dir, report.by_package))
+        )
+        # the exports write independent files, so overlap their I/O
+        pool = ThreadPool(self.EXPORT_THREADS)
+        try:
+            results = [pool.apply_async(f, args) for f, args in tasks]
+            for result in results:
+                result.get()
+        finally:
+            pool.close()
+            pool.join()
 
 
 class HarosAnalyseRunner(HarosCommonExporter):
+    __slots__ = ("project_file", "use_repos", "parse_nodes", "copy_env",
+                 "use_cache", "whitelist", "blacklist", "viz_install")
+
+    # maximum number of past reports kept in haros.db
+    HISTORY_LIMIT = 20
+
     distro_url = ("https://raw.githubusercontent.com/ros/rosdistro/master/"
                   + os.environ.get("ROS_DISTRO", "kinetic")
                   + "/distribution.yaml")
@@ -485,6 +611,7 @@ class HarosAnalyseRunner(HarosCommonExporter):
         self.database = None
         self.current_dir = None
         self.json_dir = None
+        self.viz_install = None
         if data_dir:
             self.export_viz = True
             self.viz_dir = data_dir
@@ -494,33 +621,57 @@ class HarosAnalyseRunner(HarosCommonExporter):
             self.io_projects_dir = self.project_dir
         self.data_dir = os.path.join(self.viz_dir, "data")
 
+    # run_from_source -> path; resource lookups are slow, do them once
+    _definitions_files = {}
+
     @property
     def definitions_file(self):
-        if self.run_from_source:
-            return os.path.abspath(os.path.join(os.path.dirname(__file__),
-                                   "definitions.yaml"))
-        return resource_filename(Requirement.parse("haros"),
-                                 "haros/definitions.yaml")
+        path = self._definitions_files.get(self.run_from_source)
+        if path is None:
+            if self.run_from_source:
+                path = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                       "definitions.yaml"))
+            else:
+                path = resource_filename(Requirement.parse("haros"),
+                                         "haros/definitions.yaml")
+            self._definitions_files[self.run_from_source] = path
+        return path
 
     def run(self):
         if self.settings is None:
             self._load_settings()
-        self.database = HarosDatabase()
-        plugins, rules, metrics = self._load_definitions_and_plugins()
-        node_cache = {}
-        if self.parse_nodes and self.use_cache:
-            parse_cache = os.path.join(self.root, "parse_cache.json")
-            try:
-                with open(parse_cache, "r") as f:
-                    node_cache = json.load(f)
-            except IOError as e:
-                self.log.warning("Could not read parsing cache: %s", e)
-        configs, nodes, env = self._extract_metamodel(node_cache, rules)
-        self._load_database()
-        self._extract_configurations(self.database.project, configs, nodes, env)
-        self._analyse(plugins, rules, metrics)
-        self._save_results(node_cache)
-        self.database = None
+        viz_pool = None
+        if self.export_viz:
+            # copying the viz files does not depend on the analysis,
+            # so it runs in the background until _save_results needs it;
+            # the path must be absolute, the analysis changes the cwd
+            from . import visualiser as viz
+            viz_pool = ThreadPool(1)
+            self.viz_install = viz_pool.apply_async(viz.install,
+                    (os.path.abspath(self.viz_dir), self.run_from_source))
+        try:
+            self.database = HarosDatabase()
+            plugins, rules, metrics = self._load_definitions_and_plugins()
+            node_cache = {}
+            if self.parse_nodes and self.use_cache:
+                parse_cache = os.path.join(self.root, "parse_cache.json")
+                try:
+                    with open(parse_cache, "r") as f:
+                        node_cache = json.load(f)
+                except IOError as e:
+                    self.log.warning("Could not read parsing cache: %s", e)
+            configs, nodes, env = self._extract_metamodel(node_cache, rules)
+            self._load_database()
+            self._extract_configurations(self.database.project, configs,
+                                         nodes, env)
+            self._analyse(plugins, rules, metrics)
+            self._save_results(node_cache)
+            self.database = None
+        finally:
+            if viz_pool:
+                viz_pool.close()
+                viz_pool.join()
+            self.viz_install = None
         return True
 
     def _extract_metamodel(self, node_cache, rules):
@@ -528,6 +679,7 @@ class HarosAnalyseRunner(HarosCommonExporter):
         self.log.debug("Project file %s", self.project_file)
         env = dict(os.environ) if self.copy_env else self.settings.environment
         distro = self.distro_url if self.use_repos else None
+        from .extractor import ProjectExtractor
         extractor = ProjectExtractor(self.project_file, env = env,
                                      repo_path = self.repo_dir,
                                      distro_url = distro,
@@ -536,8 +688,12 @@ class HarosAnalyseRunner(HarosCommonExporter):
                                      parse_nodes = self.parse_nodes)
         if self.parse_nodes:
             print "  > Parsing nodes might take some time."
+        cache_file = None
+        if self.use_cache:
+            cache_file = os.path.join(self.root, "index_cache.db")
         # NOTE: this updates settings with ignore-line comments
-        extractor.index_source(settings = self.settings)
+        extractor.index_source(settings = self.settings,
+                               cache_file = cache_file)
         self.project = extractor.project.name
         if not extractor.project.packages:
             raise RuntimeError("There are no packages to analyse.")
@@ -549,6 +705,10 @@ class HarosAnalyseRunner(HarosCommonExporter):
         return extractor.configurations, extractor.node_specs, env
 
     def _extract_configurations(self, project, configs, nodes, environment):
+        from .config_builder import ConfigurationBuilder
+        sep = os.sep
+        pkgs = {pkg.name: pkg for pkg in self.database.packages.itervalues()}
+        files = {sf.path: sf for sf in self.database.files.itervalues()}
         for name, data in configs.iteritems():
             if isinstance(data, list):
                 builder = ConfigurationBuilder(name, environment, self.database)
@@ -558,14 +718,14 @@ class HarosAnalyseRunner(HarosCommonExporter):
                     nodes=nodes, hints=data.get("hints"))
                 launch_files = data["launch"]
             for launch_file in launch_files:
-                parts = launch_file.split(os.sep, 1)
-                if not len(parts) == 2:
+                pkg_name, found, rel_path = launch_file.partition(sep)
+                if not found:
                     raise ValueError("invalid launch file: " + launch_file)
-                pkg = self.database.packages.get("package:" + parts[0])
+                pkg = pkgs.get(pkg_name)
                 if not pkg:
-                    raise ValueError("unknown package: " + parts[0])
-                path = os.path.join(pkg.path, parts[1])
-                launch = self.database.get_file(path)
+                    raise ValueError("unknown package: " + pkg_name)
+                path = os.path.join(pkg.path, rel_path)
+                launch = files.get(path)
                 if not launch:
                     raise ValueError("unknown launch file: " + launch_file)
                 builder.add_launch(launch)
@@ -588,21 +748,27 @@ class HarosAnalyseRunner(HarosCommonExporter):
             # to old packages, files, etc. There will be multiple versions
             # of the same projects over time, as long as the history exists.
             # This is why I added "compact" to the database.
-            self.database.history = haros_db.history
-            self.database.history.append(haros_db.report)
+            history = list(haros_db.history)
+            history.append(haros_db.report)
+            self.database.history = history[-self.HISTORY_LIMIT:]
 
     def _load_definitions_and_plugins(self):
         rules = set()
         metrics = set()
         print "[HAROS] Loading common definitions..."
+        cache_file = None
+        if self.use_cache:
+            cache_file = os.path.join(self.root, "definitions_cache.json")
         rs, ms = self.database.load_definitions(self.definitions_file,
                 ignored_rules=self.settings.ignored_rules,
                 ignored_tags=self.settings.ignored_tags,
-                ignored_metrics=self.settings.ignored_metrics)
+                ignored_metrics=self.settings.ignored_metrics,
+                cache_file=cache_file)
         rules.update(rs)
         metrics.update(ms)
         print "[HAROS] Loading plugins..."
         blacklist = self.blacklist or self.settings.plugin_blacklist
+        from .plugin_manager import Plugin
         plugins = Plugin.load_plugins(whitelist=self.whitelist,
                                       blacklist=blacklist,
                                       common_rules=self.database.rules,
@@ -627,6 +793,7 @@ class HarosAnalyseRunner(HarosCommonExporter):
         return plugins, rules, metrics
 
     def _analyse(self, plugins, rules, metrics):
+        from .analysis_manager import AnalysisManager
         print "[HAROS] Running analysis..."
         self._empty_dir(self.export_dir)
         temp_path = tempfile.mkdtemp()
@@ -640,9 +807,10 @@ class HarosAnalyseRunner(HarosCommonExporter):
             rmtree(temp_path)
 
     def _save_results(self, node_cache):
+        from .export_manager import JsonExporter
         print "[HAROS] Saving analysis results..."
-        if self.export_viz:
-            viz.install(self.viz_dir, self.run_from_source)
+        if self.viz_install is not None:
+            self.viz_install.get()
         self._ensure_dir(self.data_dir)
         self._ensure_dir(self.current_dir)
         self.database.save_state(os.path.join(self.current_dir, "haros.db"))
@@ -653,13 +821,13 @@ class HarosAnalyseRunner(HarosCommonExporter):
         exporter.export_projects(self.data_dir, (self.database.project,),
                                  overwrite = False)
         if self.parse_nodes and self.use_cache:
-            for node in self.database.nodes.itervalues():
-                node_cache[node.node_name] = node.to_JSON_object()
+            node_cache.update({node.node_name: node.to_JSON_object()
+                               for node in self.database.nodes.itervalues()})
             parse_cache = os.path.join(self.root, "parse_cache.json")
             try:
-                with open(parse_cache, "w") as f:
-                    json.dump(node_cache, f)
-            except IOError as e:
+                with atomic_open(parse_cache, "w") as f:
+                    f.write(json.dumps(node_cache))
+            except (IOError, OSError) as e:
                 self.log.warning("Could not save parsing cache: %s", e)
 
 
@@ -682,6 +850,8 @@ class HarosAnalyseRunner(HarosCommonExporter):
     # dir/data/<name>
 
 class HarosExportRunner(HarosCommonExporter):
+    __slots__ = ("project_data_list", "haros_db")
+
     def __init__(self, haros_dir, config_path, data_dir, export_viz, project,
                  log = None, run_from_source = False):
         HarosRunner.__init__(self, haros_dir, config_path, log, run_from_source)
@@ -700,6 +870,7 @@ class HarosExportRunner(HarosCommonExporter):
             self.io_projects_dir = data_dir
 
     def run(self):
+        from .export_manager import JsonExporter
         print "[HAROS] Exporting analysis results..."
         self._prepare_directory()
         exporter = JsonExporter()
@@ -716,12 +887,19 @@ class HarosExportRunner(HarosCommonExporter):
 
     def _prepare_directory(self):
         if self.export_viz:
+            from . import visualiser as viz
             viz.install(self.viz_dir, self.run_from_source)
         self._ensure_dir(self.data_dir)
-        self._ensure_dir(self.io_projects_dir)
+        # without viz, projects and data share the same directory
+        if self.io_projects_dir != self.data_dir:
+            self._ensure_dir(self.io_projects_dir)
 
     def _project_list(self):
         if self.project == "all":
+            if scandir is not None:
+                # directory entries carry their type, no stat per entry
+                return [entry.name for entry in scandir(self.project_dir)
+                        if entry.is_dir()]
             return [name for name in os.listdir(self.project_dir)
                     if os.path.isdir(os.path.join(self.project_dir, name))]
         return [self.project]
@@ -740,7 +918,41 @@ class HarosExportRunner(HarosCommonExporter):
     def _save_database(self):
         db_path = os.path.join(self.current_dir, "haros.db")
         self.log.debug("Copying %s to %s", self.haros_db, db_path)
-        copyfile(self.haros_db, db_path)
+        _copy_file(self.haros_db, db_path)
+
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+def _copy_file(src, dst):
+    """Copy a file within the kernel (sendfile) when the platform allows,
+        falling back to a regular user space copy.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise ShutilError("`%s` and `%s` are the same file" % (src, dst))
+    if sendfile is not None:
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                size = os.fstat(src_fd).st_size
+                offset = 0
+                while offset < size:
+                    sent = sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except OSError as e:
+                # e.g. file systems that do not support sendfile
+                if e.errno not in (errno.EINVAL, errno.ENOSYS):
+                    raise
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+    with open(src, "rb") as src_file:
+        with open(dst, "wb") as dst_file:
+            copyfileobj(src_file, dst_file, COPY_BUFFER_SIZE)
 
 
 ###############################################################################
@@ -748,6 +960,8 @@ class HarosExportRunner(HarosCommonExporter):
 ###############################################################################
 
 class HarosVizRunner(HarosRunner):
+    __slots__ = ("server_dir", "host", "headless")
+
     def __init__(self, haros_dir, config_path, server_dir, host_str, headless, log = None,
                  run_from_source = False):
         HarosRunner.__init__(self, haros_dir, config_path, log, run_from_source)
@@ -756,6 +970,7 @@ class HarosVizRunner(HarosRunner):
         self.headless = headless
 
     def run(self):
+        from . import visualiser as viz
         return viz.serve(self.server_dir, self.host, headless = self.headless)
 
 
@@ -48,6 +48,35 @@ class cwd:
         os.chdir(self.old_path)
 
 
+class atomic_open:
+    """Write a file through a temporary file in the same directory,
+        which replaces the target only if the block completes.
+    """
+    def __init__(self, path, mode = "w"):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.mode = mode
+
+    def __enter__(self):
+        self.handle = open(self.tmp_path, self.mode)
+        return self.handle
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.handle.flush()
+                os.fsync(self.handle.fileno())
+        finally:
+            self.handle.close()
+        if exc_type is None:
+            os.rename(self.tmp_path, self.path)
+        else:
+            try:
+                os.unlink(self.tmp_path)
+            except OSError:
+                pass
+
+
 # Credits to:
 # http://stackoverflow.com/a/2022629
 class Event(list):
@@ -45,6 +45,10 @@ class BaseHTTPRequestHandler(SimpleHTTPRequestHandler):
 
 _log = logging.getLogger(__name__)
 
+# resolved at import time, since install may run while the cwd changes
+_SOURCE_VIZ = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                              "..", "harosviz"))
+
 
 def install(dst, source_runner, force = False):
     if force and os.path.exists(dst):
@@ -54,11 +58,11 @@ def install(dst, source_runner, force = False):
         os.mkdir(dst)
     _log.info("Copying viz files.")
     if source_runner:
-        src = os.path.abspath(os.path.join(os.path.dirname(__file__),
-                              "..", "harosviz"))
+        src = _SOURCE_VIZ
     else:
         src = resource_filename(Requirement.parse("haros"), "harosviz")
-    copy_tree(src, dst)
+    # copy_tree preserves mtimes, so unchanged assets can be skipped
+    copy_tree(src, dst, update = True)
     data_dir = os.path.join(dst, "data")
     if not os.path.exists(data_dir):
         _log.info("Creating %s", data_dir)